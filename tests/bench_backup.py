@@ -0,0 +1,121 @@
+"""Benchmark of online backups: writer latency while create_backup copies a large database.
+
+Fills a throwaway database with GB gigabytes of jobs, then registers users
+through POST /users from a writer thread at a steady rate, first on its own
+and then while create_backup() snapshots the database. Reports the backup's
+duration and steps, and the writer's p50/p99/max latency in both phases.
+
+    python tests/bench_backup.py [GB]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+DB_DIR = tempfile.mkdtemp(prefix='cvgw-bench-')
+os.environ['CVGW_DATABASE_URI'] = 'sqlite:///' + os.path.join(DB_DIR, 'app.db')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import email_validator  # noqa: E402
+
+email_validator.CHECK_DELIVERABILITY = False
+
+import cv_gateway  # noqa: E402
+from cv_gateway import Job, JobStatus, User, UserRole, UserStatus, app, date, db, run_migrations  # noqa: E402
+
+GB = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+CHUNK_ROWS = 2000
+# Random hex halves under CompressedText, so each job stores about 4 KiB
+DESCRIPTION_BYTES = 4096
+WRITE_INTERVAL = 0.005
+BASELINE_SECONDS = 5.0
+
+
+def seed():
+    recruiter = User(email='recruiter@bench.example.com', password='pw', first_name='R', last_name='R',
+                     date_of_birth=date(1980, 1, 1), address='x',
+                     role=UserRole.RECRUITER, status=UserStatus.APPROVED)
+    db.session.add(recruiter)
+    db.session.commit()
+    path = os.path.join(DB_DIR, 'app.db')
+    target = GB * 1024 ** 3
+    while os.path.getsize(path) < target:
+        db.session.execute(db.insert(Job), [{
+            'title': 'Filler job', 'company': f'Company {n % 100}',
+            'description': os.urandom(DESCRIPTION_BYTES).hex(),
+            'required_skills': 'python', 'posting_date': date(2026, 1, 1),
+            'status': JobStatus.APPROVED, 'recruiter_id': recruiter.id,
+        } for n in range(CHUNK_ROWS)])
+        db.session.commit()
+        db.session.execute(db.text('PRAGMA wal_checkpoint(TRUNCATE)'))
+    return os.path.getsize(path)
+
+
+class Writer(threading.Thread):
+    """Registers a new user every WRITE_INTERVAL seconds and records (start, latency) per request."""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.samples = []
+        self.failures = 0
+        self.stopped = threading.Event()
+
+    def run(self):
+        client = app.test_client()
+        n = 0
+        while not self.stopped.is_set():
+            started = time.monotonic()
+            response = client.post('/users', data={
+                'email': f'writer{n}@bench.example.com', 'password': 'pw', 'first_name': 'W',
+                'last_name': 'W', 'date_of_birth': '1990-01-01', 'address': 'x',
+            })
+            self.samples.append((started, time.monotonic() - started))
+            if response.status_code != 201:
+                self.failures += 1
+            n += 1
+            time.sleep(WRITE_INTERVAL)
+
+    def latencies(self, start, end):
+        """Latencies of the requests in flight at any point between start and end."""
+        return sorted(latency for started, latency in self.samples if started < end and started + latency > start)
+
+
+def summary(latencies):
+    if not latencies:
+        return 'no writes'
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return f'{len(latencies):6d} writes  p50 {p50 * 1000:7.1f} ms  p99 {p99 * 1000:7.1f} ms  max {latencies[-1] * 1000:8.1f} ms'
+
+
+def main():
+    app.config['RATE_LIMITS'] = {}
+    app.config['RATE_LIMITS_PER_ADDRESS'] = {}
+    cv_gateway.BACKUP_DIR = os.path.join(DB_DIR, 'backups')
+    with app.app_context():
+        run_migrations(lambda message: None)
+        started = time.monotonic()
+        size = seed()
+        print(f'database: {size / 1024 ** 3:.2f} GiB, filled in {time.monotonic() - started:.0f}s')
+
+        writer = Writer()
+        writer.start()
+        baseline_start = time.monotonic()
+        time.sleep(BASELINE_SECONDS)
+        backup_start = time.monotonic()
+        manifest = cv_gateway.create_backup('bench')
+        backup_end = time.monotonic()
+        writer.stopped.set()
+        writer.join()
+
+    print(f"backup:   {manifest['size'] / 1024 ** 3:.2f} GiB in {manifest['seconds']:.1f}s "
+          f"({manifest['steps']} steps of {cv_gateway.BACKUP_STEP_PAGES} pages, "
+          f"checksum and integrity check included)")
+    print(f'writer without backup: {summary(writer.latencies(baseline_start, backup_start))}')
+    print(f'writer during backup:  {summary(writer.latencies(backup_start, backup_end))}')
+    print(f'failed writes: {writer.failures}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+"""Load test of idle Server-Sent Event streams: how many a server process holds, and at what cost.
+
+Starts the app in a child process on a throwaway database, opens STREAMS
+connections to GET /applications/events and leaves them idle across a
+keepalive, then reports the server's OS threads and RSS, the latency of
+ordinary requests while the streams are open, and how long one approval
+and one bulk approval take to reach the applicants' streams. Every stream
+belongs to a different user. By default the child runs
+under CVGW_GEVENT=1; --threaded runs the threaded development server for
+comparison, which answers 503 past its 200-stream cap.
+
+    python tests/bench_event_streams.py [STREAMS] [--threaded]
+"""
+import http.client
+import os
+import resource
+import selectors
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+THREADED = '--threaded' in sys.argv
+HEARTBEAT = 5.0
+PROBES = 200
+BULK = 100
+PASSWORD = 'pw'
+RECRUITER = f'email=recruiter@bench.example.com&password={PASSWORD}'
+
+
+def serve(port, streams):
+    """Child process: seed one user and application per stream, then serve until killed."""
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import email_validator
+    email_validator.CHECK_DELIVERABILITY = False
+    import cv_gateway
+    from cv_gateway import Application, Job, JobStatus, User, UserRole, UserStatus, app, date, db
+
+    app.config['RATE_LIMITS'] = {}
+    app.config['RATE_LIMITS_PER_ADDRESS'] = {}
+    app.config['SSE_HEARTBEAT'] = HEARTBEAT
+    with app.app_context():
+        cv_gateway.run_migrations(lambda message: None)
+        recruiter = User(email='recruiter@bench.example.com', password=PASSWORD, first_name='R', last_name='R',
+                         date_of_birth=date(1980, 1, 1), address='x',
+                         role=UserRole.RECRUITER, status=UserStatus.APPROVED)
+        db.session.add(recruiter)
+        db.session.flush()
+        job = Job(title='Engineer', company='Bench', description='d', required_skills='python',
+                  posting_date=date(2026, 1, 1), status=JobStatus.APPROVED, recruiter_id=recruiter.id)
+        db.session.add(job)
+        db.session.flush()
+        db.session.execute(db.insert(User), [{
+            'email': f'stream{n}@bench.example.com', 'password': PASSWORD, 'first_name': 'S', 'last_name': 'S',
+            'date_of_birth': date(1990, 1, 1), 'address': 'x', 'status': UserStatus.APPROVED,
+        } for n in range(streams)])
+        # Application n belongs to the user of stream n
+        user_ids = db.session.query(User.id).filter(User.email.like('stream%')).order_by(User.id)
+        db.session.execute(db.insert(Application), [
+            {'user_id': user_id, 'job_id': job.id} for (user_id,) in user_ids
+        ])
+        db.session.commit()
+        cv_gateway.reconcile_application_counts()
+    if THREADED:
+        app.run(port=port, threaded=True)
+    else:
+        cv_gateway.serve(port=port)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(port, child):
+    for _ in range(600):
+        if child.poll() is not None:
+            raise SystemExit(f'server exited with {child.returncode}')
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise SystemExit('server did not start')
+
+
+def open_stream(port, user):
+    """Return a connected socket once the stream has started, or the HTTP status it was refused with."""
+    sock = socket.create_connection(('127.0.0.1', port))
+    sock.sendall((
+        f'GET /applications/events?email=stream{user}@bench.example.com&password={PASSWORD} HTTP/1.1\r\n'
+        'Host: bench\r\nAccept: text/event-stream\r\n\r\n'
+    ).encode())
+    received = b''
+    while b'\r\n\r\n' not in received:
+        received += sock.recv(4096)
+    status = int(received.split(b' ', 2)[1])
+    if status != 200:
+        sock.close()
+        return status
+    while b'retry:' not in received:
+        received += sock.recv(4096)
+    sock.setblocking(False)
+    return sock
+
+
+def put(connection, path, body):
+    connection.request('PUT', path, body=body, headers={'Content-Type': 'application/x-www-form-urlencoded'})
+    response = connection.getresponse()
+    response.read()
+    assert response.status == 200, response.status
+
+
+def delivery(selector, seen, targets, send):
+    """Run send() and return (streams reached, seconds) until every target stream got its event."""
+    started = time.perf_counter()
+    send()
+    drain(selector, seen, time.monotonic() + 30,
+          stop=lambda: all(b'event: application' in seen[index]['data'] for index in targets))
+    reached = sum(1 for index in targets if b'event: application' in seen[index]['data'])
+    return reached, time.perf_counter() - started
+
+
+def server_stats(pid):
+    stats = {}
+    with open(f'/proc/{pid}/status') as status:
+        for line in status:
+            key, _, value = line.partition(':')
+            if key in ('Threads', 'VmRSS'):
+                stats[key] = value.strip()
+    return stats
+
+
+def drain(selector, seen, until, stop=None):
+    """Read every readable stream into ``seen`` until the deadline or stop() is true."""
+    while time.monotonic() < until and not (stop and stop()):
+        for key, _ in selector.select(timeout=0.2):
+            try:
+                chunk = key.fileobj.recv(65536)
+            except BlockingIOError:
+                continue
+            if not chunk:
+                selector.unregister(key.fileobj)
+                seen[key.data]['closed'] = True
+                continue
+            seen[key.data]['data'] += chunk
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    requested = int(next((arg for arg in sys.argv[1:] if arg.isdigit()), 5000))
+    _, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    if requested * 2 + 100 > hard:
+        raise SystemExit(f'RLIMIT_NOFILE {hard} is too low for {requested} streams')
+
+    env = dict(os.environ)
+    env['CVGW_DATABASE_URI'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='cvgw-bench-'), 'app.db')
+    env.pop('CVGW_GEVENT', None)
+    if not THREADED:
+        env['CVGW_GEVENT'] = '1'
+    port = free_port()
+    child = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--serve', str(port), str(requested)]
+                             + (['--threaded'] if THREADED else []),
+                             env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for(port, child)
+        baseline = server_stats(child.pid)
+
+        started = time.perf_counter()
+        streams = []
+        refused = {}
+        for n in range(requested):
+            result = open_stream(port, n)
+            if isinstance(result, int):
+                refused[result] = refused.get(result, 0) + 1
+            else:
+                streams.append((n, result))
+        opened = time.perf_counter() - started
+
+        selector = selectors.DefaultSelector()
+        seen = {}
+        for index, (user, sock) in enumerate(streams):
+            selector.register(sock, selectors.EVENT_READ, index)
+            seen[index] = {'user': user, 'data': b'', 'closed': False}
+
+        # Idle across one keepalive so every stream has been parked and woken at least once
+        drain(selector, seen, time.monotonic() + HEARTBEAT * 1.5)
+        loaded = server_stats(child.pid)
+        kept_alive = sum(1 for item in seen.values() if b': keepalive' in item['data'] and not item['closed'])
+
+        connection = http.client.HTTPConnection('127.0.0.1', port)
+        connection.connect()
+        connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        latencies = []
+        for _ in range(PROBES):
+            probe_started = time.perf_counter()
+            connection.request('GET', f'/jobs/1/stats?{RECRUITER}')
+            response = connection.getresponse()
+            response.read()
+            assert response.status == 200, response.status
+            latencies.append(time.perf_counter() - probe_started)
+
+        # One decision wakes one user; a bulk decision wakes BULK users at once
+        by_user = {item['user']: index for index, item in seen.items()}
+        single = delivery(selector, seen, [by_user[0]],
+                          lambda: put(connection, '/applications/1/approve', RECRUITER))
+        bulk_targets = [by_user[n] for n in range(1, BULK + 1) if n in by_user]
+        ids = ','.join(str(n + 1) for n in range(1, BULK + 1))
+        bulk = delivery(selector, seen, bulk_targets,
+                        lambda: put(connection, '/applications/bulk', f'{RECRUITER}&action=approve&ids={ids}'))
+        connection.close()
+    finally:
+        child.kill()
+        child.wait()
+
+    print(f"{'gevent' if not THREADED else 'threaded'} server, {requested} streams requested")
+    print(f'  opened:            {len(streams)} in {opened:.1f}s, refused {refused or "none"}')
+    print(f"  server threads:    {baseline['Threads']} idle -> {loaded['Threads']} with streams open")
+    print(f"  server RSS:        {baseline['VmRSS']} idle -> {loaded['VmRSS']} with streams open")
+    print(f'  keepalive seen:    {kept_alive}/{len(streams)} streams')
+    print(f'  GET /jobs/1/stats: p50 {percentile(latencies, 0.5) * 1000:.1f} ms, '
+          f'p99 {percentile(latencies, 0.99) * 1000:.1f} ms over {PROBES} requests')
+    print(f'  one approval:      reached {single[0]}/1 stream in {single[1] * 1000:.0f} ms')
+    print(f'  bulk approval:     reached {bulk[0]}/{len(bulk_targets)} streams in {bulk[1] * 1000:.0f} ms')
+
+
+if __name__ == '__main__':
+    if '--serve' in sys.argv:
+        serve(int(sys.argv[2]), int(sys.argv[3]))
+    else:
+        main()
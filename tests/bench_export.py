@@ -0,0 +1,106 @@
+"""Benchmark of GET /admin/export: throughput and peak memory per format.
+
+Seeds a throwaway database with ROWS applications (spread over ROWS/100
+candidates and 100 jobs), then streams the whole table once in each
+format and reports rows per second and the process's peak RSS above what it
+held before the export. A flat peak as ROWS grows is the point of the
+streaming export; try 10000000 for the largest tables we expect.
+
+    python tests/bench_export.py [ROWS]
+"""
+import os
+import resource
+import sys
+import tempfile
+import time
+
+DB_DIR = tempfile.mkdtemp(prefix='cvgw-bench-')
+os.environ['CVGW_DATABASE_URI'] = 'sqlite:///' + os.path.join(DB_DIR, 'app.db')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cv_gateway import (  # noqa: E402
+    EXPORT_FORMATS, Application, Job, JobStatus, User, UserRole, UserStatus, app, date, db, run_migrations,
+)
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+JOBS = 100
+CHUNK_ROWS = 50000
+
+
+def seed():
+    recruiter = User(email='recruiter@bench.example.com', password='pw', first_name='R', last_name='R',
+                     date_of_birth=date(1980, 1, 1), address='x',
+                     role=UserRole.RECRUITER, status=UserStatus.APPROVED)
+    admin = User(email='admin@bench.example.com', password='pw', first_name='A', last_name='A',
+                 date_of_birth=date(1980, 1, 1), address='x', role=UserRole.ADMIN, status=UserStatus.APPROVED)
+    db.session.add_all([recruiter, admin])
+    db.session.flush()
+    db.session.execute(db.insert(Job), [{
+        'title': f'Software engineer {n}', 'company': f'Company {n}', 'description': 'd',
+        'required_skills': 'python', 'posting_date': date(2026, 1, 1),
+        'status': JobStatus.APPROVED, 'recruiter_id': recruiter.id,
+    } for n in range(JOBS)])
+    candidates = -(-ROWS // JOBS)
+    for start in range(0, candidates, CHUNK_ROWS):
+        db.session.execute(db.insert(User), [{
+            'email': f'candidate{n}@bench.example.com', 'password': 'pw', 'first_name': 'Candidate',
+            'last_name': f'Number {n}', 'date_of_birth': date(1990, 1, 1), 'address': 'x',
+            'status': UserStatus.APPROVED,
+        } for n in range(start, min(start + CHUNK_ROWS, candidates))])
+    db.session.commit()
+    first_user = admin.id + 1
+    first_job = db.session.query(db.func.min(Job.id)).scalar()
+    for start in range(0, ROWS, CHUNK_ROWS):
+        db.session.execute(db.insert(Application), [
+            {'user_id': first_user + n // JOBS, 'job_id': first_job + n % JOBS}
+            for n in range(start, min(start + CHUNK_ROWS, ROWS))
+        ])
+        db.session.commit()
+
+
+def rss_kib(field):
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith(field + ':'):
+                return int(line.split()[1])
+
+
+def reset_peak():
+    """Start VmHWM again from the current RSS (Linux 4.0+)."""
+    with open('/proc/self/clear_refs', 'w') as clear_refs:
+        clear_refs.write('5')
+
+
+def export(client, fmt):
+    reset_peak()
+    held = rss_kib('VmRSS')
+    started = time.perf_counter()
+    response = client.get(f'/admin/export?admin_email=admin@bench.example.com&entity=applications&format={fmt}',
+                          buffered=False)
+    assert response.status_code == 200, response.status_code
+    size = 0
+    for chunk in response.iter_encoded():
+        size += len(chunk)
+    response.close()
+    return size, time.perf_counter() - started, (rss_kib('VmHWM') - held) / 1024
+
+
+def main():
+    app.config['RATE_LIMITS'] = {}
+    app.config['RATE_LIMITS_PER_ADDRESS'] = {}
+    with app.app_context():
+        run_migrations(lambda message: None)
+        started = time.perf_counter()
+        seed()
+        print(f'{ROWS} applications seeded in {time.perf_counter() - started:.0f}s')
+    client = app.test_client()
+    print(f"{'format':8} {'MiB':>10} {'seconds':>9} {'rows/s':>10} {'peak RSS above start':>22}")
+    for fmt in EXPORT_FORMATS:
+        size, seconds, peak = export(client, fmt)
+        print(f'{fmt:8} {size / 1024 ** 2:10.1f} {seconds:9.1f} {ROWS / seconds:10.0f} {peak:19.1f} MiB')
+    print(f'process peak RSS (ru_maxrss, seeding included): '
+          f'{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB')
+
+
+if __name__ == '__main__':
+    main()
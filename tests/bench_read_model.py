@@ -0,0 +1,141 @@
+"""Benchmark of the Core read path: latency and tracemalloc peak per collection route.
+
+Seeds a throwaway database with ROWS jobs, candidates with profiles and
+applications, then reports each collection route's best time and peak traced
+memory, and compares loading the job columns as ORM objects (how the routes
+read before) with the Core rows job_rows() returns. Memory is also given per
+100k rows so runs of different sizes compare directly.
+
+    python tests/bench_read_model.py [ROWS]
+"""
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+DB_DIR = tempfile.mkdtemp(prefix='cvgw-bench-')
+os.environ['CVGW_DATABASE_URI'] = 'sqlite:///' + os.path.join(DB_DIR, 'app.db')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm import load_only  # noqa: E402
+
+from cv_gateway import (  # noqa: E402
+    Application, Job, JobStatus, Profile, User, UserRole, UserStatus, app, date, db, job_rows,
+    reconcile_application_counts, run_migrations,
+)
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+REPEAT = 3
+MIB = 1024 ** 2
+
+
+def seed():
+    recruiter = User(email='recruiter@bench.example.com', password='pw', first_name='R', last_name='R',
+                     date_of_birth=date(1980, 1, 1), address='x',
+                     role=UserRole.RECRUITER, status=UserStatus.APPROVED)
+    admin = User(email='admin@bench.example.com', password='pw', first_name='A', last_name='A',
+                 date_of_birth=date(1980, 1, 1), address='x', role=UserRole.ADMIN, status=UserStatus.APPROVED)
+    db.session.add_all([recruiter, admin])
+    db.session.flush()
+    db.session.execute(db.insert(Job), [{
+        'title': f'Software engineer {n}', 'company': f'Company {n % 50}', 'description': 'd' * 200,
+        'required_skills': 'python', 'posting_date': date(2026, 1, 1 + n % 28),
+        'status': JobStatus.APPROVED, 'recruiter_id': recruiter.id,
+    } for n in range(ROWS)])
+    db.session.execute(db.insert(User), [{
+        'email': f'candidate{n}@bench.example.com', 'password': 'pw', 'first_name': 'Candidate',
+        'last_name': f'Number {n}', 'date_of_birth': date(1990, 1, 1), 'address': 'x',
+        'status': UserStatus.APPROVED,
+    } for n in range(ROWS)])
+    candidate_ids = [user_id for (user_id,) in db.session.query(User.id).filter(User.email.like('candidate%'))]
+    db.session.execute(db.insert(Profile), [{
+        'user_id': user_id, 'summary': 'Backend developer', 'skills': 'python',
+        'education': 'BSc', 'experience': 'Five years',
+    } for user_id in candidate_ids])
+    first_job = db.session.query(db.func.min(Job.id)).scalar()
+    db.session.execute(db.insert(Application), [
+        {'user_id': user_id, 'job_id': first_job} for user_id in candidate_ids
+    ])
+    db.session.commit()
+    reconcile_application_counts()
+    return first_job
+
+
+def traced(fn):
+    """Run fn() once under tracemalloc; return (result, MiB still held by it, peak MiB)."""
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained / MIB, peak / MIB
+
+
+def best_time(fn):
+    best = None
+    for _ in range(REPEAT):
+        gc.collect()
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def per_100k(mib):
+    return mib * 100000 / ROWS
+
+
+def main():
+    app.config['RATE_LIMITS'] = {}
+    app.config['RATE_LIMITS_PER_ADDRESS'] = {}
+    with app.app_context():
+        run_migrations(lambda message: None)
+        job_id = seed()
+    recruiter = 'email=recruiter@bench.example.com&password=pw'
+    cases = [
+        ('GET /jobs', f'/jobs?{recruiter}&fields=id,title,company,posting_date'),
+        ('GET /users', '/users?admin_email=admin@bench.example.com&fields=id,email,first_name,last_name,status'),
+        ('GET /users (with profile)',
+         '/users?admin_email=admin@bench.example.com&fields=id,email,first_name,last_name,status,profile'),
+        ('GET /jobs/{id}/applications', f'/jobs/{job_id}/applications?{recruiter}&fields=id,user_id,status,email'),
+    ]
+    client = app.test_client()
+
+    def get(url):
+        response = client.get(url)
+        assert response.status_code == 200, response.data[:200]
+        return response
+
+    print(f'{ROWS} rows per collection, best of {REPEAT}')
+    print(f"{'route':30} {'ms':>8} {'peak MiB':>10} {'per 100k':>10}")
+    for label, url in cases:
+        seconds = best_time(lambda: get(url))
+        _, _, peak = traced(lambda: get(url))
+        print(f'{label:30} {seconds * 1000:8.0f} {peak:10.1f} {per_100k(peak):10.1f}')
+
+    fields = ['id', 'title', 'company', 'posting_date']
+    loaders = [
+        ('ORM Job objects', lambda: Job.query.options(
+            load_only(Job.id, Job.title, Job.company, Job.posting_date)
+        ).filter(Job.status == JobStatus.APPROVED).all()),
+        ('Core job_rows()', lambda: job_rows(Job, fields, [Job.status == JobStatus.APPROVED])),
+    ]
+    print()
+    print(f"{'loader':30} {'ms':>8} {'held MiB':>10} {'per 100k':>10} {'peak MiB':>10}")
+    with app.app_context():
+        for label, load in loaders:
+            def fresh_load():
+                db.session.expunge_all()
+                return load()
+            seconds = best_time(fresh_load)
+            rows, retained, peak = traced(fresh_load)
+            assert len(rows) == ROWS
+            del rows
+            print(f'{label:30} {seconds * 1000:8.0f} {retained:10.1f} {per_100k(retained):10.1f} {peak:10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark of fields= projections: response bytes and latency, full versus sparse.
+
+Seeds a throwaway database with ROWS jobs, users and applications, then
+requests each collection route with no fields= (the full payload every
+client got before projections) and with a typical sparse projection.
+
+    python tests/bench_sparse_fields.py [ROWS]
+"""
+import os
+import sys
+import tempfile
+import time
+
+DB_DIR = tempfile.mkdtemp(prefix='cvgw-bench-')
+os.environ['CVGW_DATABASE_URI'] = 'sqlite:///' + os.path.join(DB_DIR, 'app.db')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cv_gateway import (  # noqa: E402
+    Application, Job, JobStatus, Profile, User, UserRole, UserStatus, app, date, db,
+    reconcile_application_counts, run_migrations,
+)
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+REPEAT = 3
+
+
+def seed():
+    recruiter = User(email='recruiter@bench.example.com', password='pw', first_name='R', last_name='R',
+                     date_of_birth=date(1980, 1, 1), address='x',
+                     role=UserRole.RECRUITER, status=UserStatus.APPROVED)
+    admin = User(email='admin@bench.example.com', password='pw', first_name='A', last_name='A',
+                 date_of_birth=date(1980, 1, 1), address='x', role=UserRole.ADMIN, status=UserStatus.APPROVED)
+    db.session.add_all([recruiter, admin])
+    db.session.flush()
+    db.session.execute(db.insert(Job), [{
+        'title': f'Software engineer {n}', 'company': f'Company {n % 100}',
+        'description': 'Build and run the services behind our hiring platform. ' * 6,
+        'required_skills': 'python,sql,flask', 'posting_date': date(2026, 1, 1 + n % 28),
+        'status': JobStatus.APPROVED, 'recruiter_id': recruiter.id,
+    } for n in range(ROWS)])
+    db.session.execute(db.insert(User), [{
+        'email': f'candidate{n}@bench.example.com', 'password': 'pw', 'first_name': 'Candidate',
+        'last_name': f'Number {n}', 'date_of_birth': date(1990, 1, 1), 'address': f'{n} Long Street, Big City',
+        'status': UserStatus.APPROVED,
+    } for n in range(ROWS)])
+    candidate_ids = [user_id for (user_id,) in db.session.query(User.id).filter(User.email.like('candidate%'))]
+    db.session.execute(db.insert(Profile), [{
+        'user_id': user_id, 'summary': 'Backend developer', 'skills': 'python,sql',
+        'education': 'BSc Computer Science', 'experience': 'Five years building web services',
+    } for user_id in candidate_ids])
+    first_job = db.session.query(db.func.min(Job.id)).scalar()
+    db.session.execute(db.insert(Application), [
+        {'user_id': user_id, 'job_id': first_job} for user_id in candidate_ids
+    ])
+    db.session.commit()
+    reconcile_application_counts()
+    return first_job
+
+
+def measure(client, url):
+    best = None
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        response = client.get(url)
+        elapsed = time.perf_counter() - started
+        assert response.status_code == 200, response.data[:200]
+        best = elapsed if best is None else min(best, elapsed)
+    return len(response.data), best
+
+
+def main():
+    app.config['RATE_LIMITS'] = {}
+    app.config['RATE_LIMITS_PER_ADDRESS'] = {}
+    with app.app_context():
+        run_migrations(lambda message: None)
+        job_id = seed()
+    recruiter = 'email=recruiter@bench.example.com&password=pw'
+    cases = [
+        ('GET /jobs', f'/jobs?{recruiter}', 'id,title'),
+        ('GET /users', '/users?admin_email=admin@bench.example.com', 'id,email'),
+        (f'GET /jobs/{{id}}/applications', f'/jobs/{job_id}/applications?{recruiter}', 'id,user_id,status'),
+    ]
+    client = app.test_client()
+    print(f'{ROWS} rows per collection, best of {REPEAT}')
+    print(f"{'route':28} {'fields':20} {'bytes':>12} {'ms':>8}")
+    for label, url, fields in cases:
+        full_bytes, full_time = measure(client, url)
+        sparse_bytes, sparse_time = measure(client, f'{url}&fields={fields}')
+        print(f"{label:28} {'(all)':20} {full_bytes:12d} {full_time * 1000:8.0f}")
+        print(f"{'':28} {fields:20} {sparse_bytes:12d} {sparse_time * 1000:8.0f}"
+              f"   -{100 - 100 * sparse_bytes // full_bytes}% bytes, {full_time / sparse_time:.1f}x faster")
+
+
+if __name__ == '__main__':
+    main()
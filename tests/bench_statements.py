@@ -0,0 +1,112 @@
+"""Benchmark of the prebuilt lookup statements against building each query per request.
+
+Compares, per call, building an ad hoc filter_by() query and its cache key
+(what every request did before) with the module-level statements such as
+USER_BY_CREDENTIALS, then the full lookups through find_admin(),
+find_recruiter(), find_user() and applied_job_ids() against their ad hoc
+equivalents, and the resulting cost of one authenticated request.
+
+    python tests/bench_statements.py [CALLS]
+"""
+import os
+import sys
+import tempfile
+import time
+
+DB_DIR = tempfile.mkdtemp(prefix='cvgw-bench-')
+os.environ['CVGW_DATABASE_URI'] = 'sqlite:///' + os.path.join(DB_DIR, 'app.db')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cv_gateway import (  # noqa: E402
+    USER_BY_CREDENTIALS, Application, Job, JobStatus, User, UserRole, UserStatus, app, applied_job_ids, date, db,
+    find_admin, find_recruiter, find_user, reconcile_application_counts, run_migrations,
+)
+
+CALLS = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+REPEAT = 3
+
+
+def seed():
+    recruiter = User(email='recruiter@bench.example.com', password='pw', first_name='R', last_name='R',
+                     date_of_birth=date(1980, 1, 1), address='x',
+                     role=UserRole.RECRUITER, status=UserStatus.APPROVED)
+    admin = User(email='admin@bench.example.com', password='pw', first_name='A', last_name='A',
+                 date_of_birth=date(1980, 1, 1), address='x', role=UserRole.ADMIN, status=UserStatus.APPROVED)
+    candidate = User(email='candidate@bench.example.com', password='pw', first_name='C', last_name='C',
+                     date_of_birth=date(1990, 1, 1), address='x', status=UserStatus.APPROVED)
+    db.session.add_all([recruiter, admin, candidate])
+    db.session.flush()
+    jobs = [Job(title=f'Engineer {n}', company='Bench', description='d', required_skills='python',
+                posting_date=date(2026, 1, 1), status=JobStatus.APPROVED, recruiter_id=recruiter.id)
+            for n in range(3)]
+    db.session.add_all(jobs)
+    db.session.flush()
+    db.session.add_all([Application(user_id=candidate.id, job_id=job.id) for job in jobs])
+    db.session.commit()
+    reconcile_application_counts()
+    return candidate.id, jobs[0].id, [job.id for job in jobs]
+
+
+def per_call(fn, calls):
+    """Best of REPEAT runs, in microseconds per call."""
+    best = None
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        elapsed = (time.perf_counter() - started) / calls
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1e6
+
+
+def main():
+    app.config['RATE_LIMITS'] = {}
+    app.config['RATE_LIMITS_PER_ADDRESS'] = {}
+    with app.app_context():
+        run_migrations(lambda message: None)
+        user_id, job_id, job_ids = seed()
+
+        def ad_hoc_statement():
+            User.query.filter_by(email='candidate@bench.example.com', password='pw',
+                                 status=UserStatus.APPROVED).limit(1)._statement_20()._generate_cache_key()
+
+        print(f'{"":24} {"ad hoc µs":>10} {"prebuilt µs":>12}')
+        print(f'{"statement + cache key":24} {per_call(ad_hoc_statement, CALLS):10.1f} '
+              f'{per_call(USER_BY_CREDENTIALS._generate_cache_key, CALLS):12.1f}')
+
+        lookups = CALLS // 4
+        cases = [
+            ('find_admin',
+             lambda: User.query.filter_by(email='admin@bench.example.com', role=UserRole.ADMIN,
+                                          status=UserStatus.APPROVED).first(),
+             lambda: find_admin('admin@bench.example.com')),
+            ('find_recruiter',
+             lambda: User.query.filter_by(email='recruiter@bench.example.com', password='pw',
+                                          role=UserRole.RECRUITER, status=UserStatus.APPROVED).first(),
+             lambda: find_recruiter('recruiter@bench.example.com', 'pw')),
+            ('find_user',
+             lambda: User.query.filter_by(email='candidate@bench.example.com', password='pw',
+                                          status=UserStatus.APPROVED).first(),
+             lambda: find_user('candidate@bench.example.com', 'pw')),
+            ('applied_job_ids',
+             lambda: [job for (job,) in db.session.query(Application.job_id).filter(
+                 Application.user_id == user_id, Application.job_id.in_(job_ids))],
+             lambda: applied_job_ids(user_id, job_ids)),
+        ]
+        for label, ad_hoc, prebuilt in cases:
+            assert ad_hoc() == prebuilt()
+            print(f'{label:24} {per_call(ad_hoc, lookups):10.1f} {per_call(prebuilt, lookups):12.1f}')
+
+    client = app.test_client()
+    url = f'/jobs/{job_id}/stats?email=recruiter@bench.example.com&password=pw'
+    requests = CALLS // 10
+
+    def request():
+        response = client.get(url)
+        assert response.status_code == 200, response.data[:200]
+
+    print(f'GET /jobs/{{id}}/stats: {per_call(request, requests):.0f} µs per request')
+
+
+if __name__ == '__main__':
+    main()
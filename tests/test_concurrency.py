@@ -0,0 +1,133 @@
+"""Concurrent stress test: racing writes must never create duplicate rows or skew counters.
+
+Each case fires requests from many threads at once, released together by a
+barrier, then checks the rows and counters that were actually written.
+
+    python -m pytest -q tests
+"""
+import os
+import sys
+import tempfile
+import threading
+
+import pytest
+
+DB_DIR = tempfile.mkdtemp(prefix='cvgw-test-')
+os.environ['CVGW_DATABASE_URI'] = 'sqlite:///' + os.path.join(DB_DIR, 'app.db')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import email_validator  # noqa: E402
+
+email_validator.CHECK_DELIVERABILITY = False
+
+from cv_gateway import (  # noqa: E402
+    Application, ApplicationStatus, Job, JobApplicationCount, JobStatus, Profile, User,
+    UserRole, UserStatus, app, date, db, reconcile_application_counts, run_migrations,
+)
+
+THREADS = 16
+
+
+@pytest.fixture(scope='module')
+def seeded():
+    app.config['RATE_LIMITS'] = {}
+    app.config['RATE_LIMITS_PER_ADDRESS'] = {}
+    with app.app_context():
+        run_migrations(lambda message: None)
+        recruiter = User(email='recruiter@stress.example.com', password='pw', first_name='R', last_name='R',
+                         date_of_birth=date(1990, 1, 1), address='x',
+                         role=UserRole.RECRUITER, status=UserStatus.APPROVED)
+        candidate = User(email='candidate@stress.example.com', password='pw', first_name='C', last_name='C',
+                         date_of_birth=date(1990, 1, 1), address='x', status=UserStatus.APPROVED)
+        db.session.add_all([recruiter, candidate])
+        db.session.flush()
+        jobs = [Job(title=f'Job {n}', company='Stress', description='d', required_skills='python',
+                    posting_date=date(2026, 1, 1), status=JobStatus.APPROVED, recruiter_id=recruiter.id)
+                for n in range(2)]
+        db.session.add_all(jobs)
+        db.session.commit()
+        yield {'job_ids': [job.id for job in jobs]}
+
+
+def race(path, data, headers=None, method='POST'):
+    """Send the request from THREADS threads at once; return the status codes.
+
+    ``path`` may be a list giving each thread its own path.
+    """
+    paths = path if isinstance(path, list) else [path] * THREADS
+    barrier = threading.Barrier(THREADS)
+    statuses = []
+    lock = threading.Lock()
+
+    def worker(path):
+        client = app.test_client()
+        barrier.wait()
+        response = client.open(path, method=method, data=data, headers=headers or {})
+        with lock:
+            statuses.append(response.status_code)
+
+    threads = [threading.Thread(target=worker, args=(path,)) for path in paths]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return statuses
+
+
+def user_form(email):
+    return {'email': email, 'password': 'pw', 'first_name': 'A', 'last_name': 'B',
+            'date_of_birth': '1990-01-01', 'address': 'x'}
+
+
+@pytest.mark.parametrize('headers', [None, {'Idempotency-Key': 'register-once'}], ids=['plain', 'idempotency-key'])
+def test_concurrent_registrations_create_one_user(seeded, headers):
+    email = f"racer-{'key' if headers else 'plain'}@stress.example.com"
+    statuses = race('/users', user_form(email), headers)
+
+    assert all(status < 500 for status in statuses), statuses
+    with app.app_context():
+        users = User.query.filter_by(email=email).all()
+        assert len(users) == 1
+        assert Profile.query.filter_by(user_id=users[0].id).count() == 1
+    if headers:
+        # The winner's 201 is replayed; retries racing it are told it is in progress
+        assert set(statuses) <= {201, 409} and 201 in statuses
+    else:
+        assert statuses.count(201) == 1 and statuses.count(409) == THREADS - 1
+
+
+@pytest.mark.parametrize('headers', [None, {'Idempotency-Key': 'apply-once'}], ids=['plain', 'idempotency-key'])
+def test_concurrent_applications_create_one_row(seeded, headers):
+    job_id = seeded['job_ids'][1 if headers else 0]
+    statuses = race(f'/jobs/{job_id}/apply', {'email': 'candidate@stress.example.com', 'password': 'pw'}, headers)
+
+    assert all(status < 500 for status in statuses), statuses
+    assert 201 in statuses
+    with app.app_context():
+        candidate = User.query.filter_by(email='candidate@stress.example.com').one()
+        assert Application.query.filter_by(user_id=candidate.id, job_id=job_id).count() == 1
+        counter = db.session.get(JobApplicationCount, (job_id, ApplicationStatus.PENDING))
+        assert counter is not None and counter.count == 1
+    if not headers:
+        assert statuses.count(201) == 1 and statuses.count(409) == THREADS - 1
+
+
+def test_concurrent_decisions_keep_counters_exact(seeded):
+    job_id = seeded['job_ids'][0]
+    app.test_client().post(f'/jobs/{job_id}/apply', data={'email': 'candidate@stress.example.com', 'password': 'pw'})
+    with app.app_context():
+        candidate = User.query.filter_by(email='candidate@stress.example.com').one()
+        application = Application.query.filter_by(user_id=candidate.id, job_id=job_id).one()
+        application_id = application.id
+    actions = ['approve', 'reject'] * (THREADS // 2)
+    paths = [f'/applications/{application_id}/{action}' for action in actions]
+    statuses = race(paths, {'email': 'recruiter@stress.example.com', 'password': 'pw'}, method='PUT')
+
+    assert statuses == [200] * THREADS
+    with app.app_context():
+        assert reconcile_application_counts(dry_run=True) == {}
+        counters = {
+            status: db.session.get(JobApplicationCount, (job_id, status))
+            for status in ApplicationStatus
+        }
+        assert sum(counter.count for counter in counters.values() if counter) == 1